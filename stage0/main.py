@@ -1,5 +1,5 @@
 from fastapi import FastAPI
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 import requests
 from datetime import datetime, timezone
 
@@ -33,4 +33,4 @@ def get_profile():
     }
 
 
-    return JSONResponse(content=result, media_type="application/json")
\ No newline at end of file
+    return ORJSONResponse(content=result)
\ No newline at end of file
@@ -1,4 +1,7 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import ORJSONResponse
+from fastapi.routing import APIRoute
+import orjson
 from pydantic import BaseModel
 from datetime import datetime
 import hashlib
@@ -6,7 +9,27 @@ from collections import Counter
 from typing import Optional
 import re
 
-app = FastAPI()
+
+class ORJSONRequest(Request):
+    # Request bodies are parsed with orjson instead of the stdlib json
+    async def json(self):
+        if not hasattr(self, "_json"):
+            self._json = orjson.loads(await self.body())
+        return self._json
+
+
+class ORJSONRoute(APIRoute):
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def orjson_route_handler(request: Request):
+            return await handler(ORJSONRequest(request.scope, request.receive))
+
+        return orjson_route_handler
+
+
+app = FastAPI(default_response_class=ORJSONResponse)
+app.router.route_class = ORJSONRoute
 
 
 database = {}
@@ -0,0 +1,148 @@
+"""
+Redis cache for serialized country list responses
+"""
+
+import redis.asyncio as redis
+from typing import Optional
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Caching is enabled only when REDIS_URL is set
+REDIS_URL = os.getenv("REDIS_URL")
+COUNTRIES_CACHE_TTL = int(os.getenv("COUNTRIES_CACHE_TTL", "300"))
+COUNTRIES_KEY_PREFIX = "countries:"
+# Bumped by every invalidation; kept outside COUNTRIES_KEY_PREFIX so the scan spares it
+COUNTRIES_GENERATION_KEY = "countries_generation"
+# Seconds to wait on Redis before falling back to the database
+REDIS_TIMEOUT = 0.5
+# Sort values crud applies; anything else falls back to the name order
+_KNOWN_SORTS = frozenset({"gdp_desc", "gdp_asc", "population_desc", "population_asc"})
+
+_client: Optional[redis.Redis] = None
+
+
+def init_redis() -> Optional[redis.Redis]:
+	"""
+	Create the shared Redis client if REDIS_URL is configured
+
+	Returns:
+		The Redis client, or None when caching is disabled
+	"""
+	global _client
+	if REDIS_URL and _client is None:
+		# Short timeouts so an unreachable Redis raises instead of hanging requests
+		_client = redis.from_url(
+			REDIS_URL,
+			socket_connect_timeout=REDIS_TIMEOUT,
+			socket_timeout=REDIS_TIMEOUT
+		)
+	return _client
+
+
+async def close_redis():
+	"""
+	Close the shared Redis client
+	"""
+	global _client
+	if _client is not None:
+		await _client.aclose()
+		_client = None
+
+
+def countries_cache_key(
+	region: Optional[str],
+	currency: Optional[str],
+	sort: Optional[str]
+) -> str:
+	"""
+	Build the cache key for a country list query
+
+	Filters are lowercased since they match case-insensitively. Unknown
+	sort values share the "name" key, as they return the same order.
+	"""
+	region_key = region.lower() if region else "*"
+	currency_key = currency.lower() if currency else "*"
+	sort_key = sort if sort in _KNOWN_SORTS else "name"
+	return f"{COUNTRIES_KEY_PREFIX}{region_key}:{currency_key}:{sort_key}"
+
+
+async def get_cached_countries(key: str) -> Optional[bytes]:
+	"""
+	Get a cached country list response
+
+	Args:
+		key: Key from countries_cache_key
+
+	Returns:
+		JSON body, or None on a miss or when caching is disabled
+	"""
+	if _client is None:
+		return None
+	try:
+		return await _client.get(key)
+	except redis.RedisError as e:
+		print(f"⚠️ Warning: Redis read failed: {str(e)}")
+		return None
+
+
+async def get_countries_generation() -> Optional[int]:
+	"""
+	Get the current cache generation, read before a list query starts
+
+	Returns:
+		Generation number, or None when caching is disabled or Redis fails
+	"""
+	if _client is None:
+		return None
+	try:
+		return int(await _client.get(COUNTRIES_GENERATION_KEY) or 0)
+	except redis.RedisError as e:
+		print(f"⚠️ Warning: Redis read failed: {str(e)}")
+		return None
+
+
+async def set_cached_countries(key: str, body: bytes, generation: Optional[int]):
+	"""
+	Cache a country list response for COUNTRIES_CACHE_TTL seconds
+
+	Skipped when invalidate_countries ran after generation was read, so a
+	body built from pre-refresh rows is never cached.
+
+	Args:
+		key: Key from countries_cache_key
+		body: JSON body
+		generation: Value of get_countries_generation before the query ran
+	"""
+	if _client is None or generation is None:
+		return
+	try:
+		async with _client.pipeline(transaction=True) as pipe:
+			await pipe.watch(COUNTRIES_GENERATION_KEY)
+			if int(await pipe.get(COUNTRIES_GENERATION_KEY) or 0) != generation:
+				return
+			pipe.multi()
+			pipe.setex(key, COUNTRIES_CACHE_TTL, body)
+			await pipe.execute()
+	except redis.WatchError:
+		# Invalidated between the check and the write
+		pass
+	except redis.RedisError as e:
+		print(f"⚠️ Warning: Redis write failed: {str(e)}")
+
+
+async def invalidate_countries():
+	"""
+	Drop every cached country list after the data changes
+	"""
+	if _client is None:
+		return
+	try:
+		# Bump the generation first so in-flight list requests skip their write
+		await _client.incr(COUNTRIES_GENERATION_KEY)
+		keys = [key async for key in _client.scan_iter(match=f"{COUNTRIES_KEY_PREFIX}*")]
+		if keys:
+			await _client.delete(*keys)
+	except redis.RedisError as e:
+		print(f"⚠️ Warning: Redis invalidation failed: {str(e)}")
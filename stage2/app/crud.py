@@ -2,14 +2,40 @@
 Business logic for country data management
 """
 
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Row, Select, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from app import models
-from typing import List, Optional
-import random
-from datetime import datetime
-
-def get_country_by_name(db: Session, name: str) -> Optional[models.Country]:
+from typing import AsyncIterator, List, Optional, Sequence
+import numpy as np
+from datetime import datetime, timezone
+
+# Columns returned by the country list endpoint
+LIST_COLUMNS = (
+	models.Country.id,
+	models.Country.name,
+	models.Country.capital,
+	models.Country.region,
+	models.Country.population,
+	models.Country.currency_code,
+	models.Country.exchange_rate,
+	models.Country.estimated_gdp,
+	models.Country.last_refreshed_at
+)
+
+# Columns overwritten when a refreshed country already exists
+UPSERT_COLUMNS = (
+	"capital",
+	"region",
+	"population",
+	"currency_code",
+	"exchange_rate",
+	"estimated_gdp",
+	"flag_url",
+	"last_refreshed_at"
+)
+
+async def get_country_by_name(db: AsyncSession, name: str) -> Optional[models.Country]:
 	"""
 	Get a country by name
 
@@ -20,34 +46,38 @@ def get_country_by_name(db: Session, name: str) -> Optional[models.Country]:
 	Returns:
 		Country object or None
 	"""
-	return db.query(models.Country).filter(func.lower(models.Country.name) == func.lower(name)).first()
+	result = await db.scalars(
+		select(models.Country).where(func.lower(models.Country.name) == name.lower()).limit(1)
+	)
+	return result.first()
 
-def get_all_countries(
-	db: Session,
+def _countries_query(
 	region: Optional[str] = None,
 	currency: Optional[str] = None,
 	sort: Optional[str] = None
-) -> List[models.Country]:
+) -> Select:
 	"""
-	Get all countries with optional filtering and sorting.
+	Build the country list query with optional filtering and sorting.
+
+	Only the columns exposed by CountryResponse are selected, so rows come
+	back as plain Row tuples rather than ORM objects.
 
 	Args:
-		db: Database session
 		region: Filter by region (e.g., "Africa")
 		currency: Filter by currency code (e.g., "NGN")
 		sort: Sort order - "gdp_desc", "gdp_asc", "population_desc", "population_asc"
 
 	Returns:
-		List of Country objects
+		Select statement
 	"""
-	query = db.query(models.Country)
+	query = select(*LIST_COLUMNS)
 
-	# Apply filter
+	# Apply filter (parameters are lowercased once here, matching the lower() indexes)
 	if region:
-		query = query.filter(func.lower(models.Country.region) == func.lower(region))
+		query = query.where(func.lower(models.Country.region) == region.lower())
 
 	if currency:
-		query = query.filter(func.lower(models.Country.currency_code) == func.lower(currency))
+		query = query.where(func.lower(models.Country.currency_code) == currency.lower())
 
 	# Apply sorting
 	if sort == "gdp_desc":
@@ -61,23 +91,51 @@ def get_all_countries(
 	else:
 		query = query.order_by(models.Country.name)
 
-	return query.all()
+	return query
 
-def create_or_update_country(
-	db: Session,
-	country_data: dict,
-	exchange_rates: dict
-) -> tuple[models.Country, bool]:
+async def stream_all_countries(
+	db: AsyncSession,
+	region: Optional[str] = None,
+	currency: Optional[str] = None,
+	sort: Optional[str] = None,
+	batch_size: int = 100
+) -> AsyncIterator[Sequence[Row]]:
 	"""
-	Create nw country or update existig one
+	Get all countries with optional filtering and sorting, in batches.
+
+	Rows come from a server-side cursor, so at most batch_size are held
+	in memory at a time.
 
 	Args:
 		db: Database session
+		region: Filter by region (e.g., "Africa")
+		currency: Filter by currency code (e.g., "NGN")
+		sort: Sort order - "gdp_desc", "gdp_asc", "population_desc", "population_asc"
+		batch_size: Rows fetched per round-trip
+
+	Yields:
+		Batches of Row objects
+	"""
+	query = _countries_query(region, currency, sort).execution_options(yield_per=batch_size)
+	result = await db.stream(query)
+	async for rows in result.partitions():
+		yield rows
+
+def _build_country_row(
+	country_data: dict,
+	exchange_rates: dict,
+	refreshed_at: datetime
+) -> Optional[dict]:
+	"""
+	Extract a country row from REST Countries data
+
+	Args:
 		country_data: Country data from external API
 		exchange_rates: Dictionary of exchange rates
+		refreshed_at: Timestamp stored as last_refreshed_at
 
 	Returns:
-		Tuple of (Country object, was_created: bool)
+		Dictionary of column values, or None if the country has no name
 	"""
 
 	# Extract name (REST Countries v3 format)
@@ -89,10 +147,7 @@ def create_or_update_country(
 		name = country_data.get("name")
 	
 	if not name:
-		return None, False
-	
-	# Check if country exists
-	existing = get_country_by_name(db, name)
+		return None
 
 	# Extract currency code
 	currencies = country_data.get("currencies", {})
@@ -104,20 +159,14 @@ def create_or_update_country(
 		if isinstance(first_currency, dict):
 			currency_code = first_currency.get('code')
 	elif isinstance(currencies, dict) and currencies:
-		currency_code = list(currencies.key())[0]
+		currency_code = next(iter(currencies), None)
 
 	exchange_rate = None
 	estimated_gdp = None
 
+	# estimated_gdp for priced countries is filled in by _estimate_gdps
 	if currency_code and currency_code in exchange_rates:
 		exchange_rate = exchange_rates[currency_code]
-
-
-		# Calculate estimated GDP
-		population = country_data.get("population", 0)
-		if population > 0 and exchange_rate >0:
-			random_multiplier = random.uniform(1000, 2000)
-			estimated_gdp = (population * random_multiplier) / exchange_rate
 	elif not currency_code:
 		estimated_gdp = 0.0
 
@@ -138,7 +187,7 @@ def create_or_update_country(
 
 
 	# Prepare country data
-	country_dict = {
+	return {
 		"name": name,
 		"capital": capital,
 		"region": country_data.get("region"),
@@ -147,25 +196,83 @@ def create_or_update_country(
 		"exchange_rate": exchange_rate,
 		"estimated_gdp": estimated_gdp,
 		"flag_url": flag_url,
-		"last_refreshed_at": datetime.utcnow()
+		"last_refreshed_at": refreshed_at
 	}
 
-	if existing:
-		# Update existing country
-		for key, value in country_dict.items():
-			setattr(existing, key, value)
-		db.commit()
-		db.refresh(existing)
-		return existing, False
-	else:
-		# Create new country
-		new_country = models.Country(**country_dict)
-		db.add(new_country)
-		db.commit()
-		db.refresh(new_country)
-		return new_country, True
+def _estimate_gdps(rows: List[dict]):
+	"""
+	Fill estimated_gdp for priced rows in one vectorized pass
+
+	Args:
+		rows: Country rows that have an exchange rate
+	"""
+	if not rows:
+		return
+
+	populations = np.array([row["population"] or 0 for row in rows], dtype=np.float64)
+	rates = np.array([row["exchange_rate"] for row in rows], dtype=np.float64)
+	multipliers = np.random.uniform(1000, 2000, size=len(rows))
+
+	# No estimate without population and a positive rate
+	valid = (populations > 0) & (rates > 0)
+	gdps = np.divide(populations * multipliers, rates, out=np.zeros_like(populations), where=valid)
+
+	for row, gdp, ok in zip(rows, gdps.tolist(), valid.tolist()):
+		if ok:
+			row["estimated_gdp"] = gdp
+
+async def bulk_upsert_countries(
+	db: AsyncSession,
+	countries_payload: List[dict],
+	exchange_rates: dict,
+	refreshed_at: Optional[datetime] = None
+) -> tuple[int, int, int]:
+	"""
+	Create or update all countries in a single INSERT ... ON CONFLICT statement
+
+	Args:
+		db: Database session
+		countries_payload: List of country data from external API
+		exchange_rates: Dictionary of exchange rates
+		refreshed_at: Timestamp shared by every row, defaults to now
+
+	Returns:
+		Tuple of (created_count, updated_count, total_countries)
+	"""
+
+	# One SELECT for every existing name instead of one per country
+	existing_names = await db.scalars(select(models.Country.name))
+	existing = {name.lower() for name in existing_names.all()}
+
+	# Key by lowercase name so duplicates in the payload collapse to the last one,
+	# ON CONFLICT cannot touch the same row twice in one statement
+	refreshed_at = refreshed_at or datetime.now(timezone.utc)
+	rows = {}
+	for country_data in countries_payload:
+		row = _build_country_row(country_data, exchange_rates, refreshed_at)
+		if row is not None:
+			rows[row["name"].lower()] = row
+
+	if not rows:
+		return 0, 0, len(existing)
+
+	_estimate_gdps([row for row in rows.values() if row["exchange_rate"] is not None])
+
+	stmt = pg_insert(models.Country).values(list(rows.values()))
+	stmt = stmt.on_conflict_do_update(
+		index_elements=[models.Country.name],
+		set_={col: stmt.excluded[col] for col in UPSERT_COLUMNS}
+	)
+	await db.execute(stmt)
+	await db.commit()
+
+	updated_count = sum(1 for key in rows if key in existing)
+	created_count = len(rows) - updated_count
+
+	# Every created row is new, so the table size follows without a COUNT(*)
+	return created_count, updated_count, len(existing) + created_count
 	
-def delete_country(db: Session, name: str) -> bool:
+async def delete_country(db: AsyncSession, name: str) -> bool:
 	"""
 	Delete a country by name
 
@@ -177,15 +284,15 @@ def delete_country(db: Session, name: str) -> bool:
 		True if deleted, False if not found
 	"""
 
-	country = get_country_by_name(db, name)
+	country = await get_country_by_name(db, name)
 	if country:
-		db.delete(country)
-		db.commit()
+		await db.delete(country)
+		await db.commit()
 		return True
 	return False
 
 
-def get_or_create_metadata(db: Session) -> models.RefreshMetadata:
+async def get_or_create_metadata(db: AsyncSession) -> models.RefreshMetadata:
 	"""
 	Get or create refresh metadata record
 
@@ -196,28 +303,56 @@ def get_or_create_metadata(db: Session) -> models.RefreshMetadata:
 		RefreshMetadata object
 	"""
 
-	metadata = db.query(models.RefreshMetadata).first()
+	result = await db.scalars(select(models.RefreshMetadata).limit(1))
+	metadata = result.first()
 	if not metadata:
 		metadata = models.RefreshMetadata(total_countries=0)
 		db.add(metadata)
-		db.commit()
-		db.refresh(metadata)
+		await db.commit()
+		await db.refresh(metadata)
 	return metadata
 
-def update_metadata(db: Session, total_countries: int):
+async def update_metadata(
+	db: AsyncSession,
+	total_countries: int,
+	refreshed_at: Optional[datetime] = None
+):
 	"""
 	Update refresh metadata.
 
 	Args:
 		db: Database session
 		total_countries: Total number of countries in database
+		refreshed_at: Refresh timestamp, defaults to now
 	"""
-	metadata = get_or_create_metadata(db)
+	metadata = await get_or_create_metadata(db)
 	metadata.total_countries = total_countries
-	metadata.last_refreshed_at = datetime.utcnow()
-	db.commit()
+	metadata.last_refreshed_at = refreshed_at or datetime.now(timezone.utc)
+	await db.commit()
 
-def get_top_countries_by_gdp(db: Session, limit: int = 5) -> List[models.Country]:
+async def decrement_total_countries(db: AsyncSession):
+	"""
+	Decrement the cached country count after a delete.
+
+	Args:
+		db: Database session
+	"""
+	result = await db.execute(
+		update(models.RefreshMetadata)
+		.values(
+			total_countries=models.RefreshMetadata.total_countries - 1,
+			last_refreshed_at=datetime.now(timezone.utc)
+		)
+		.execution_options(synchronize_session=False)
+	)
+	if not result.rowcount:
+		# No metadata yet, fall back to counting once
+		total_countries = await db.scalar(select(func.count()).select_from(models.Country))
+		await update_metadata(db, total_countries)
+		return
+	await db.commit()
+
+async def get_top_countries_by_gdp(db: AsyncSession, limit: int = 5) -> List[models.Country]:
 	"""
 	Get top countries by estimated GDP.
 
@@ -229,4 +364,10 @@ def get_top_countries_by_gdp(db: Session, limit: int = 5) -> List[models.Country
 		List of Country objects
 	"""
 
-	return db.query(models.Country).filter(models.Country.estimated_gdp.isnot(None)).order_by(models.Country.estimated_gdp.desc()).limit(limit).all()
\ No newline at end of file
+	result = await db.scalars(
+		select(models.Country)
+		.where(models.Country.estimated_gdp.isnot(None))
+		.order_by(models.Country.estimated_gdp.desc())
+		.limit(limit)
+	)
+	return result.all()
\ No newline at end of file
@@ -1,6 +1,5 @@
-from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
 import os
 from dotenv import load_dotenv
 
@@ -28,15 +27,27 @@ if not DATABASE_URL:
     
     DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 
+# Use the asyncpg driver so queries do not block the event loop
+if DATABASE_URL.startswith("postgresql://"):
+    DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
+
 # Create database engine
+# Pool sized for concurrent requests; pre-ping and recycle drop stale connections
 
-engine = create_engine(DATABASE_URL)
+engine = create_async_engine(
+	DATABASE_URL,
+	pool_size=20,
+	max_overflow=10,
+	pool_pre_ping=True,
+	pool_recycle=1800,
+	pool_timeout=30
+)
 
 
 # SessionLocal: Factory for database sessions
-SessionLocal = sessionmaker(
-	autocommit=False,
+SessionLocal = async_sessionmaker(
 	autoflush=False,
+	expire_on_commit=False,
 	bind=engine
 )
 
@@ -45,9 +56,24 @@ Base = declarative_base()
 
 
 # Dependency to inject database session
-def get_db():
-	db = SessionLocal()
-	try:
+async def get_db():
+	async with SessionLocal() as db:
 		yield db
-	finally:
-		db.close()
+
+
+async def init_db():
+	"""
+	Create all tables and indexes that do not exist yet
+	"""
+	# Import models so their tables are registered on Base
+	from app import models
+
+	def create_indexes(sync_conn):
+		# create_all only builds indexes along with a new table, so add any
+		# declared later (e.g. the lower() ones) to tables that already exist
+		for idx in models.Country.__table__.indexes:
+			idx.create(sync_conn, checkfirst=True)
+
+	async with engine.begin() as conn:
+		await conn.run_sync(Base.metadata.create_all)
+		await conn.run_sync(create_indexes)
@@ -5,6 +5,7 @@ Fetches data from restcountries.com and exchange rate API
 import httpx
 from typing import Dict, List, Optional
 import os
+import time
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -14,6 +15,40 @@ EXCHANGE_API_URL = os.getenv("EXCHANGE_API_URL", "https://open.er-api.com/v6/lat
 
 TIMEOUT = 30.0
 
+# Exchange rates are reused for this many seconds before fetching again
+RATES_CACHE_TTL = float(os.getenv("RATES_CACHE_TTL", "300"))
+_rates_cache = {"data": None, "ts": 0.0}
+
+# Shared client, created on startup so connections are reused between refreshes
+_client: Optional[httpx.AsyncClient] = None
+
+
+def init_http_client() -> httpx.AsyncClient:
+	"""
+	Create the shared HTTP client with HTTP/2 and a keep-alive pool
+	
+	Returns:
+		The shared httpx.AsyncClient
+	"""
+	global _client
+	if _client is None or _client.is_closed:
+		_client = httpx.AsyncClient(
+			timeout=TIMEOUT,
+			http2=True,
+			limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+		)
+	return _client
+
+
+async def close_http_client():
+	"""
+	Close the shared HTTP client and its pooled connections
+	"""
+	global _client
+	if _client is not None:
+		await _client.aclose()
+		_client = None
+
 async def fetch_countries() -> List[Dict]:
 	"""
 	Fetch all countries from REST Countries API
@@ -27,26 +62,26 @@ async def fetch_countries() -> List[Dict]:
 	if not COUNTRIES_API_URL:
 		raise Exception("COUNTRIES_API_URL environment variable not set")
 	
-	async with httpx.AsyncClient(timeout=TIMEOUT) as client:
-		try:
-			response = await client.get(COUNTRIES_API_URL)
-			response.raise_for_status()
-			data = response.json()
-			
-			# Validate response
-			if not isinstance(data, list):
-				raise Exception(f"Expected list from countries API, got {type(data)}")
-			
-			return data
-			
-		except httpx.TimeoutException:
-			raise Exception(f"Timeout while fetching countries from {COUNTRIES_API_URL}")
-		except httpx.HTTPStatusError as e:
-			raise Exception(f"HTTP {e.response.status_code} error fetching countries: {str(e)}")
-		except httpx.HTTPError as e:
-			raise Exception(f"HTTP error fetching countries: {str(e)}")
-		except Exception as e:
-			raise Exception(f"Unexpected error fetching countries: {str(e)}")
+	client = init_http_client()
+	try:
+		response = await client.get(COUNTRIES_API_URL)
+		response.raise_for_status()
+		data = response.json()
+		
+		# Validate response
+		if not isinstance(data, list):
+			raise Exception(f"Expected list from countries API, got {type(data)}")
+		
+		return data
+		
+	except httpx.TimeoutException:
+		raise Exception(f"Timeout while fetching countries from {COUNTRIES_API_URL}")
+	except httpx.HTTPStatusError as e:
+		raise Exception(f"HTTP {e.response.status_code} error fetching countries: {str(e)}")
+	except httpx.HTTPError as e:
+		raise Exception(f"HTTP error fetching countries: {str(e)}")
+	except Exception as e:
+		raise Exception(f"Unexpected error fetching countries: {str(e)}")
 
 
 async def fetch_exchange_rates() -> Dict[str, float]:
@@ -62,32 +97,38 @@ async def fetch_exchange_rates() -> Dict[str, float]:
 	if not EXCHANGE_API_URL:
 		raise Exception("EXCHANGE_API_URL environment variable not set")
 	
-	async with httpx.AsyncClient(timeout=TIMEOUT) as client:
-		try:
-			response = await client.get(EXCHANGE_API_URL)
-			response.raise_for_status()
-			data = response.json()
-			
-			# Validate response structure
-			if not isinstance(data, dict):
-				raise Exception(f"Expected dict from exchange API, got {type(data)}")
-			
-			if "rates" not in data:
-				raise Exception("No 'rates' key in exchange rate response")
-			
-			rates = data["rates"]
-			
-			if not isinstance(rates, dict):
-				raise Exception(f"Expected dict for rates, got {type(rates)}")
-			
-			return rates
-			
-		except httpx.TimeoutException:
-			raise Exception(f"Timeout while fetching exchange rates from {EXCHANGE_API_URL}")
-		except httpx.HTTPStatusError as e:
-			raise Exception(f"HTTP {e.response.status_code} error fetching exchange rates: {str(e)}")
-		except httpx.HTTPError as e:
-			raise Exception(f"HTTP error fetching exchange rates: {str(e)}")
-		except Exception as e:
-			raise Exception(f"Unexpected error fetching exchange rates: {str(e)}")
+	# Serve recent rates from the in-process cache
+	if _rates_cache["data"] is not None and time.monotonic() - _rates_cache["ts"] < RATES_CACHE_TTL:
+		return _rates_cache["data"]
+	
+	client = init_http_client()
+	try:
+		response = await client.get(EXCHANGE_API_URL)
+		response.raise_for_status()
+		data = response.json()
+		
+		# Validate response structure
+		if not isinstance(data, dict):
+			raise Exception(f"Expected dict from exchange API, got {type(data)}")
+		
+		if "rates" not in data:
+			raise Exception("No 'rates' key in exchange rate response")
+		
+		rates = data["rates"]
+		
+		if not isinstance(rates, dict):
+			raise Exception(f"Expected dict for rates, got {type(rates)}")
+		
+		_rates_cache["data"] = rates
+		_rates_cache["ts"] = time.monotonic()
+		return rates
+		
+	except httpx.TimeoutException:
+		raise Exception(f"Timeout while fetching exchange rates from {EXCHANGE_API_URL}")
+	except httpx.HTTPStatusError as e:
+		raise Exception(f"HTTP {e.response.status_code} error fetching exchange rates: {str(e)}")
+	except httpx.HTTPError as e:
+		raise Exception(f"HTTP error fetching exchange rates: {str(e)}")
+	except Exception as e:
+		raise Exception(f"Unexpected error fetching exchange rates: {str(e)}")
 
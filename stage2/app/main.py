@@ -1,43 +1,44 @@
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
+from fastapi.responses import JSONResponse, ORJSONResponse
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from contextlib import asynccontextmanager
+from datetime import datetime
 import os
 from dotenv import load_dotenv
 
 # Import database components
-from app.database import engine, Base, get_db
+from app.database import engine, get_db, init_db
 from app.routers import countries
+from app.external_apis import init_http_client, close_http_client
+from app.cache import init_redis, close_redis
 from app import crud, schemas
 # Load environment variables
 load_dotenv()
 
-# Create FastAPI instance
-app = FastAPI(
-	title="Country Currency & Exchange API",
-	description="RESTful API for country data with real-time exchange rate"
-)
+# Health check query, built once and reused
+_HEALTH_PING = text("SELECT 1")
 
-# Configure CORS
-app.add_middleware(
-	CORSMiddleware,
-	allow_origins=["*"],
-	allow_credentials=True,
-	allow_methods=["*"],
-	allow_headers=["*"]
-)
-
-@app.on_event("startup")
-async def startup_event():
+@asynccontextmanager
+async def lifespan(app: FastAPI):
 	print("\n" + "=" * 50)
 	print("Country 💵Currency API Starting Up")
 	print("=" * 50)
 
-	# Create database tables
-	print("Creating database tables")
-	Base.metadata.create_all(bind=engine)
-	print("Database tables created")
+	# Create database tables only when asked, normally done once at release
+	if os.getenv("RUN_MIGRATIONS", "false").lower() in ("1", "true"):
+		print("Creating database tables")
+		await init_db()
+		print("Database tables created")
+
+	# Open the shared HTTP client for external APIs
+	init_http_client()
+
+	# Connect the response cache when REDIS_URL is set
+	if init_redis():
+		print("Redis response cache enabled")
 
 	# Show documentatiosn URLS
 	host = os.getenv("HOST", "0.0.0.0")
@@ -48,12 +49,32 @@ async def startup_event():
 	print(f"	OpenAPI:	http://localhost:{port}/openapi.json")
 	print("=" * 50)
 
-@app.on_event("shutdown")
-async def shutdown_event():
+	yield
+
+	await close_http_client()
+	await close_redis()
+	await engine.dispose()
 	print("\n" + "=" * 50)
 	print("Country Currency API Shutting Down")
 	print("=" * 50)
 
+# Create FastAPI instance
+app = FastAPI(
+	title="Country Currency & Exchange API",
+	description="RESTful API for country data with real-time exchange rate",
+	default_response_class=ORJSONResponse,
+	lifespan=lifespan
+)
+
+# Configure CORS
+app.add_middleware(
+	CORSMiddleware,
+	allow_origins=["*"],
+	allow_credentials=True,
+	allow_methods=["*"],
+	allow_headers=["*"]
+)
+
 @app.get("/", tags=["Health"])
 def root():
 
@@ -72,9 +93,9 @@ def root():
 	}
 
 @app.get("/health", tags=["Health"])
-def health_check(db: Session = Depends(get_db)):
+async def health_check(db: AsyncSession = Depends(get_db)):
 	try:
-		db.execute("SELECT 1")
+		await db.execute(_HEALTH_PING)
 		return {
 			"status": "healthy",
 			"database": "connected",
@@ -89,7 +110,7 @@ def health_check(db: Session = Depends(get_db)):
 		}
 
 @app.get("/status", response_model=schemas.StatusResponse, tags=["Status"])
-def get_status(db: Session = Depends(get_db)):
+async def get_status(db: AsyncSession = Depends(get_db)):
 	"""
 	Get API statistics.
 
@@ -97,7 +118,7 @@ def get_status(db: Session = Depends(get_db)):
 		- total_countries: Total number of countries in database
 		- last_refreshed_at: Timestamp of last data refresh
 	"""
-	metadata = crud.get_or_create_metadata(db)
+	metadata = await crud.get_or_create_metadata(db)
 
 	return {
 		"total_countries": metadata.total_countries,
@@ -0,0 +1,20 @@
+"""
+Create the database tables, run once per release (see Procfile)
+
+Kept out of app.database: running that module with -m would load it twice,
+and the models would register on the imported copy's Base, not the one
+create_all reads.
+"""
+
+import asyncio
+
+from app.database import engine, init_db
+
+
+async def main():
+	await init_db()
+	await engine.dispose()
+
+
+if __name__ == "__main__":
+	asyncio.run(main())
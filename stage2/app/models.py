@@ -2,7 +2,7 @@
 Define database tables structure
 """
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, func
+from sqlalchemy import Column, Integer, String, Float, DateTime, Index, func
 from app.database import Base
 
 
@@ -35,6 +35,13 @@ class Country(Base):
 		nullable=False
 )
 
+	# Case-insensitive lookups compare lower(column), so index that expression
+	__table_args__ = (
+		Index("ix_countries_name_lower", func.lower(name)),
+		Index("ix_countries_region_lower", func.lower(region)),
+		Index("ix_countries_currency_code_lower", func.lower(currency_code)),
+	)
+
 	def __repr__(self):
 		return f"<Country(name='{self.name}', region='{self.region}', currency='{self.currency_code}')>"
 
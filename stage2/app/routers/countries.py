@@ -4,23 +4,73 @@ All routes related to country data management.
 """
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session
-from typing import Optional, List
-from datetime import datetime
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import AsyncIterator, Optional, List, Sequence
+from datetime import datetime, timezone
+import asyncio
 import os
 from pathlib import Path
 
 from app.database import get_db
-from app import crud, schemas
+from app import cache, crud, schemas
 from app.external_apis import fetch_countries, fetch_exchange_rates
 from app.image_generator import generate_summary_image
 
 router = APIRouter()
 
+# Validates and serializes the country list in a single pydantic-core pass
+country_list_adapter = TypeAdapter(List[schemas.CountryResponse])
+
+
+def _encode_batch(rows: Sequence) -> bytes:
+    """
+    Validate and encode a batch of rows as JSON array items, without brackets.
+    """
+    validated = country_list_adapter.validate_python(rows, from_attributes=True)
+    # Strip the surrounding brackets so batches join into one array
+    return country_list_adapter.dump_json(validated)[1:-1]
+
+
+async def _stream_country_list(
+    first_chunk: bytes,
+    batches: AsyncIterator[Sequence],
+    cache_key: str,
+    generation: Optional[int]
+) -> AsyncIterator[bytes]:
+    """
+    Encode row batches as one JSON array, a batch at a time.
+    
+    first_chunk is the already encoded first batch; the rest come from batches.
+    The full body is only kept when it needs to be written to the cache.
+    """
+    parts = [] if generation is not None else None
+    
+    yield b"["
+    first = not first_chunk
+    if first_chunk:
+        if parts is not None:
+            parts.append(first_chunk)
+        yield first_chunk
+    async for rows in batches:
+        chunk = _encode_batch(rows)
+        if not chunk:
+            continue
+        if not first:
+            chunk = b"," + chunk
+        first = False
+        if parts is not None:
+            parts.append(chunk)
+        yield chunk
+    yield b"]"
+    
+    if parts is not None:
+        await cache.set_cached_countries(cache_key, b"[" + b"".join(parts) + b"]", generation)
+
 
 @router.post("/refresh", response_model=schemas.RefreshResponse)
-async def refresh_countries(db: Session = Depends(get_db)):
+async def refresh_countries(db: AsyncSession = Depends(get_db)):
     """
     Fetch all countries and exchange rates, then cache them in database.
     
@@ -39,39 +89,39 @@ async def refresh_countries(db: Session = Depends(get_db)):
     - 503: External API unavailable
     """
     try:
-        # Fetch data from external APIs
-        print("📡 Fetching countries from external API...")
-        countries_data = await fetch_countries()
+        # Fetch data from external APIs concurrently
+        print("📡 Fetching countries and exchange rates from external APIs...")
+        countries_data, exchange_rates = await asyncio.gather(
+            fetch_countries(),
+            fetch_exchange_rates(),
+            return_exceptions=True
+        )
         
-        print("💱 Fetching exchange rates...")
-        exchange_rates = await fetch_exchange_rates()
+        # Re-raise in the original order so the failing API is still reported
+        if isinstance(countries_data, BaseException):
+            raise countries_data
+        if isinstance(exchange_rates, BaseException):
+            raise exchange_rates
         
         print(f"✅ Fetched {len(countries_data)} countries and {len(exchange_rates)} exchange rates")
         
-        # Process each country
-        created_count = 0
-        updated_count = 0
+        # One timestamp for the whole refresh
+        refreshed_at = datetime.now(timezone.utc)
         
-        for country_data in countries_data:
-            country, was_created = crud.create_or_update_country(
-                db=db,
-                country_data=country_data,
-                exchange_rates=exchange_rates
-            )
-            
-            if country is None:
-                continue
-            if was_created:
-                created_count += 1
-            else:
-                updated_count += 1
+        # Store all countries in one upsert
+        created_count, updated_count, total_countries = await crud.bulk_upsert_countries(
+            db=db,
+            countries_payload=countries_data,
+            exchange_rates=exchange_rates,
+            refreshed_at=refreshed_at
+        )
         
         # Update metadata
-        total_countries = db.query(crud.models.Country).count()
-        crud.update_metadata(db, total_countries)
+        await crud.update_metadata(db, total_countries, refreshed_at)
+        await cache.invalidate_countries()
         
         # Get top countries for image
-        top_countries = crud.get_top_countries_by_gdp(db, limit=5)
+        top_countries = await crud.get_top_countries_by_gdp(db, limit=5)
         
         # Generate summary image
         cache_dir = os.getenv("CACHE_DIR", "cache")
@@ -81,7 +131,7 @@ async def refresh_countries(db: Session = Depends(get_db)):
             generate_summary_image(
                 total_countries=total_countries,
                 top_countries=top_countries,
-                last_refresh=datetime.utcnow(),
+                last_refresh=refreshed_at,
                 output_path=image_path
             )
             print(f"🖼️ Summary image generated at {image_path}")
@@ -93,7 +143,7 @@ async def refresh_countries(db: Session = Depends(get_db)):
             "countries_processed": len(countries_data),
             "countries_created": created_count,
             "countries_updated": updated_count,
-            "timestamp": datetime.utcnow()
+            "timestamp": refreshed_at
         }
         
     except Exception as e:
@@ -116,12 +166,16 @@ async def refresh_countries(db: Session = Depends(get_db)):
         )
 
 
-@router.get("", response_model=List[schemas.CountryResponse])
-def get_countries(
+@router.get(
+    "",
+    response_model=None,
+    responses={200: {"model": List[schemas.CountryResponse]}}
+)
+async def get_countries(
     region: Optional[str] = Query(None, description="Filter by region (e.g., Africa)"),
     currency: Optional[str] = Query(None, description="Filter by currency code (e.g., NGN)"),
     sort: Optional[str] = Query(None, description="Sort order: gdp_desc, gdp_asc, population_desc, population_asc"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get all countries from database with optional filtering and sorting.
@@ -140,17 +194,36 @@ def get_countries(
     **Returns:**
     - List of country objects
     """
-    countries = crud.get_all_countries(
+    cache_key = cache.countries_cache_key(region, currency, sort)
+    cached = await cache.get_cached_countries(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+    
+    # Read before the query runs, so a refresh during streaming cancels the cache write
+    generation = await cache.get_countries_generation()
+    
+    # The db session stays open until the response has been sent: FastAPI
+    # < 0.106 (pinned 0.104.1) runs get_db's teardown after the response
+    batches = crud.stream_all_countries(
         db=db,
         region=region,
         currency=currency,
         sort=sort
     )
-    return countries
+    # Run the query and encode the first batch before any headers are sent, so
+    # connection, query and validation errors still return a 500, not a cut-off 200
+    try:
+        first_chunk = _encode_batch(await anext(batches))
+    except StopAsyncIteration:
+        first_chunk = b""
+    return StreamingResponse(
+        _stream_country_list(first_chunk, batches, cache_key, generation),
+        media_type="application/json"
+    )
 
 @router.get("/status", response_model=schemas.StatusResponse)
-def get_status(db: Session = Depends(get_db)):
-    metadata = crud.get_or_create_metadata(db)
+async def get_status(db: AsyncSession = Depends(get_db)):
+    metadata = await crud.get_or_create_metadata(db)
     
     return {
         "total_countries": metadata.total_countries,
@@ -204,7 +277,7 @@ def get_summary_image():
 
 
 @router.get("/{name}", response_model=schemas.CountryResponse)
-def get_country(name: str, db: Session = Depends(get_db)):
+async def get_country(name: str, db: AsyncSession = Depends(get_db)):
     """
     Get a single country by name.
     
@@ -221,7 +294,7 @@ def get_country(name: str, db: Session = Depends(get_db)):
     **Errors:**
     - 404: Country not found
     """
-    country = crud.get_country_by_name(db, name)
+    country = await crud.get_country_by_name(db, name)
     
     if not country:
         raise HTTPException(
@@ -233,7 +306,7 @@ def get_country(name: str, db: Session = Depends(get_db)):
 
 
 @router.delete("/{name}")
-def delete_country(name: str, db: Session = Depends(get_db)):
+async def delete_country(name: str, db: AsyncSession = Depends(get_db)):
     """
     Delete a country by name.
     
@@ -246,7 +319,7 @@ def delete_country(name: str, db: Session = Depends(get_db)):
     **Errors:**
     - 404: Country not found
     """
-    deleted = crud.delete_country(db, name)
+    deleted = await crud.delete_country(db, name)
     
     if not deleted:
         raise HTTPException(
@@ -255,8 +328,8 @@ def delete_country(name: str, db: Session = Depends(get_db)):
         )
     
     # Update metadata
-    total_countries = db.query(crud.models.Country).count()
-    crud.update_metadata(db, total_countries)
+    await crud.decrement_total_countries(db)
+    await cache.invalidate_countries()
     
     return {
         "message": f"Country '{name}' deleted successfully",
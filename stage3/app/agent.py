@@ -1,9 +1,133 @@
 import re
-from typing import List
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import List, Optional
 
 from .models import EarthquakeFilter, TelexResponse, EarthquakeEvent
 from .earthquake import EarthquakeAPIClient
 
+# Patterns used by parse_message, compiled once at import. re.ASCII keeps
+# \s and \d on ASCII tables; the phrases they match are all ASCII
+# Magnitude forms (">=5", "m5+", "5+", "greater than 5", "above 5") in one
+# alternation, one group each, numbered in priority order
+_MAG_RE = re.compile(
+    r'>\s*=\s*([0-9]+(?:\.[0-9]+)?)'
+    r'|(?:mag(?:nitude)?|m)\s*([0-9]+(?:\.[0-9]+)?)\+?'
+    r'|([0-9]+(?:\.[0-9]+)?)\s*\+'
+    r'|greater than\s*([0-9]+(?:\.[0-9]+)?)'
+    r'|above\s*([0-9]+(?:\.[0-9]+)?)',
+    re.ASCII,
+)
+_HOURS_RE = re.compile(r'(?:last|past)\s+(\d+)\s+hours?', re.ASCII)
+_DAYS_RE = re.compile(r'(?:last|past)\s+(\d+)\s+days?', re.ASCII)
+_LIMIT_RE = re.compile(r'(?:show|list|get)\s+(\d+)', re.ASCII)
+_WORD_SPLIT_RE = re.compile(r'\W+')
+
+_GREETING_WORDS = frozenset({"hello", "hi", "hey"})
+_LOCATION_WORDS = frozenset({"in", "near", "around"})
+_PERIOD_UNITS = frozenset({"hour", "hours", "day", "days"})
+_DEFAULT_HOURS_BACK = EarthquakeFilter.model_fields["hours_back"].default
+_UTC = timezone.utc
+
+# Fixed replies, built once instead of on every greeting or help message
+_GREETING_RESPONSE = TelexResponse(
+    response=(
+        "Hello! I monitor earthquakes worldwide.\n\n"
+        "Try:\n"
+        "• show 5 earthquakes above magnitude 5 in the last 24 hours\n"
+        "• earthquakes in Japan in the last 7 days\n"
+        "• magnitude 6+ today near Indonesia"
+    )
+)
+_HELP_RESPONSE = TelexResponse(
+    response=(
+        "I can filter by:\n"
+        "• Magnitude (e.g., '>=5', 'm5+', 'above 4.5')\n"
+        "• Time (e.g., 'last 24 hours', 'past 7 days', 'today')\n"
+        "• Location (e.g., 'in Japan', 'near California')\n"
+        "• Limit (e.g., 'show 10')\n"
+    )
+)
+
+
+def _words(low: str) -> set:
+    """Whole words in a lowercased message, split on non-word characters"""
+    return set(_WORD_SPLIT_RE.split(low))
+
+
+def _is_time_phrase(toks: List[str]) -> bool:
+    """Whether tokens form a time phrase like 'the last 7 days' or 'past 24 hours'"""
+    if toks and toks[0] == "the":
+        toks = toks[1:]
+    return (
+        len(toks) == 3
+        and toks[0] in ("last", "past")
+        and toks[1].isdigit()
+        and toks[2].strip('.,!?') in _PERIOD_UNITS
+    )
+
+
+def _parse_location(low: str) -> Optional[str]:
+    """Location after the rightmost in/near/around not followed by a time phrase"""
+    toks = low.split()
+    end = len(toks)
+    for i in range(len(toks) - 1, -1, -1):
+        if toks[i] not in _LOCATION_WORDS:
+            continue
+        tail = toks[i + 1:end]
+        if tail and not _is_time_phrase(tail):
+            loc = " ".join(tail[:4]).strip('.,!?')
+            if loc:
+                return loc
+        end = i
+    return None
+
+
+@lru_cache(maxsize=1024)
+def _parse_message(message: str) -> EarthquakeFilter:
+    """Parse a message into filters; cached since the result depends only on the text"""
+    msg = message.strip()
+    low = msg.lower()
+    f = {}
+
+    tokens = _words(low)
+
+    # Magnitude patterns
+    # Highest-priority form wins, wherever it appears; ties go to the leftmost
+    m = min(_MAG_RE.finditer(low), key=lambda match: match.lastindex, default=None)
+    if m:
+        f["min_magnitude"] = float(m.group(m.lastindex))
+
+    # Time patterns
+    mh = _HOURS_RE.search(low)
+    if mh:
+        f["hours_back"] = int(mh.group(1))
+    
+    md = _DAYS_RE.search(low)
+    if md:
+        f["hours_back"] = int(md.group(1)) * 24
+    
+    if "today" in tokens:
+        f["hours_back"] = max(f.get("hours_back", _DEFAULT_HOURS_BACK), 24)
+    
+    if "week" in tokens and not md:
+        f["hours_back"] = max(f.get("hours_back", _DEFAULT_HOURS_BACK), 7 * 24)
+
+    # Limit
+    mlimit = _LIMIT_RE.search(low)
+    if mlimit:
+        try:
+            f["limit"] = int(mlimit.group(1))
+        except ValueError:
+            pass
+
+    # Location
+    loc = _parse_location(low)
+    if loc:
+        f["location"] = loc
+
+    return EarthquakeFilter(**f)
+
 
 class EarthquakeAgent:
     """AI agent for earthquake monitoring"""
@@ -12,73 +136,7 @@ class EarthquakeAgent:
         self.api_client = EarthquakeAPIClient()
 
     def parse_message(self, message: str) -> EarthquakeFilter:
-        msg = (message or "").strip()
-        low = msg.lower()
-        f = EarthquakeFilter()
-
-        # Magnitude patterns
-        patterns = [
-            r'>=\s*([0-9]+(?:\.[0-9]+)?)',
-            r'>\s*=\s*([0-9]+(?:\.[0-9]+)?)',
-            r'(?:mag(?:nitude)?|m)\s*([0-9]+(?:\.[0-9]+)?)\+?',
-            r'([0-9]+(?:\.[0-9]+)?)\s*\+',
-            r'greater than\s*([0-9]+(?:\.[0-9]+)?)',
-            r'above\s*([0-9]+(?:\.[0-9]+)?)',
-        ]
-        for p in patterns:
-            m = re.search(p, low)
-            if m:
-                try:
-                    f.min_magnitude = float(m.group(1))
-                    break
-                except ValueError:
-                    pass
-
-        # Time patterns
-        mh = re.search(r'(?:last|past)\s+(\d+)\s+hours?', low)
-        if mh:
-            f.hours_back = int(mh.group(1))
-        
-        md = re.search(r'(?:last|past)\s+(\d+)\s+days?', low)
-        if md:
-            f.hours_back = int(md.group(1)) * 24
-        
-        if re.search(r'\btoday\b', low):
-            f.hours_back = max(f.hours_back or 0, 24)
-        
-        if re.search(r'\bweek\b', low) and not md:
-            f.hours_back = max(f.hours_back or 0, 7 * 24)
-
-        # Limit
-        mlimit = re.search(r'(?:show|list|get)\s+(\d+)', low)
-        if mlimit:
-            try:
-                f.limit = int(mlimit.group(1))
-            except ValueError:
-                pass
-
-        # Location
-        loc = None
-        mloc = re.search(r'(?:\b(in|near|around)\b)\s+([A-Za-z][A-Za-z\s\-\.,]+)$', low)
-        if mloc:
-            candidate = mloc.group(2).strip().strip('.,!?')
-            if not re.search(r'^\s*the\s+last\s+\d+\s+(?:days?|hours?)\s*$', candidate):
-                words = candidate.split()
-                loc = " ".join(words[:4])
-        
-        if not loc:
-            for kw in [" in ", " near ", " around "]:
-                if kw in low:
-                    part = low.rsplit(kw, 1)[-1].strip()
-                    if re.match(r'^the\s+last\s+\d+\s+(?:days?|hours?)$', part):
-                        continue
-                    loc = " ".join(part.split()[:4]).strip('.,!?')
-                    break
-        
-        if loc:
-            f.location = loc
-
-        return f
+        return _parse_message(message or "")
 
     def _format_response(self, events: List[EarthquakeEvent], filters: EarthquakeFilter) -> str:
         hrs = int(filters.hours_back or 24)
@@ -99,40 +157,27 @@ class EarthquakeAgent:
 
         lines = [header, ""]
         for i, ev in enumerate(events, 1):
-            alert = f" [{ev.alert_level.upper()}]" if ev.alert_level else ""
+            alert_level, url = ev.alert_level, ev.url
+            alert = f" [{alert_level.upper()}]" if alert_level else ""
             tsunami = " ⚠️ TSUNAMI WARNING" if ev.tsunami else ""
-            lines.append(f"{i}. M{ev.magnitude:.1f} — {ev.place}")
-            lines.append(f"   {ev.time.strftime('%Y-%m-%d %H:%M:%S')} UTC")
-            lines.append(f"   Lat: {ev.latitude:.2f}, Lon: {ev.longitude:.2f} | Depth: {ev.depth:.1f} km{tsunami}{alert}")
-            if ev.url:
-                lines.append(f"   {ev.url}")
+            lines.extend((
+                f"{i}. M{ev.magnitude:.1f} — {ev.place}",
+                f"   {datetime.fromtimestamp(ev.time_ms / 1000, tz=_UTC).strftime('%Y-%m-%d %H:%M:%S')} UTC",
+                f"   Lat: {ev.latitude:.2f}, Lon: {ev.longitude:.2f} | Depth: {ev.depth:.1f} km{tsunami}{alert}",
+            ))
+            if url:
+                lines.append(f"   {url}")
             lines.append("")
         return "\n".join(lines).rstrip()
 
     async def process_message(self, message: str) -> TelexResponse:
-        low = (message or "").lower()
+        tokens = _words((message or "").lower())
 
-        if any(g in low for g in ["hello", "hi", "hey"]):
-            return TelexResponse(
-                response=(
-                    "Hello! I monitor earthquakes worldwide.\n\n"
-                    "Try:\n"
-                    "• show 5 earthquakes above magnitude 5 in the last 24 hours\n"
-                    "• earthquakes in Japan in the last 7 days\n"
-                    "• magnitude 6+ today near Indonesia"
-                )
-            )
+        if not _GREETING_WORDS.isdisjoint(tokens):
+            return _GREETING_RESPONSE
 
-        if "help" in low:
-            return TelexResponse(
-                response=(
-                    "I can filter by:\n"
-                    "• Magnitude (e.g., '>=5', 'm5+', 'above 4.5')\n"
-                    "• Time (e.g., 'last 24 hours', 'past 7 days', 'today')\n"
-                    "• Location (e.g., 'in Japan', 'near California')\n"
-                    "• Limit (e.g., 'show 10')\n"
-                )
-            )
+        if "help" in tokens:
+            return _HELP_RESPONSE
 
         try:
             filters = self.parse_message(message)
@@ -1,72 +1,154 @@
+import asyncio
 import httpx
+import ijson
+import logging
+import re
+import time
 from datetime import datetime, timedelta, timezone
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 from .models import EarthquakeEvent, EarthquakeFilter
 
+logger = logging.getLogger(__name__)
+
+def _valid_coords(coords) -> bool:
+    """GeoJSON point with numeric longitude, latitude and depth"""
+    return (
+        isinstance(coords, list)
+        and len(coords) >= 3
+        and all(isinstance(c, (int, float)) for c in coords[:3])
+    )
+
+
+def _to_events(features: List[dict]) -> List[EarthquakeEvent]:
+    """Build events from GeoJSON features, skipping ones without valid coordinates"""
+    # Local names avoid global/attribute lookups inside the comprehension
+    Event = EarthquakeEvent
+
+    return [
+        Event(
+            id=feat.get("id", ""),
+            magnitude=props.get("mag") or 0.0,
+            place=props.get("place") or "Unknown location",
+            time_ms=props.get("time") or 0,
+            latitude=float(coords[1]),
+            longitude=float(coords[0]),
+            depth=float(coords[2]),
+            url=props.get("url") or "",
+            alert_level=props.get("alert"),
+            tsunami=(props.get("tsunami") == 1),
+        )
+        for feat in features
+        for props, coords in ((feat.get("properties") or {}, (feat.get("geometry") or {}).get("coordinates")),)
+        if _valid_coords(coords)
+    ]
+
+
 class EarthquakeAPIClient:
     BASE_URL = "https://earthquake.usgs.gov/fdsnws/event/1/query"
+    # Seconds a USGS response is reused for identical queries
+    CACHE_TTL = 30.0
 
     def __init__(self):
-        self.client = httpx.AsyncClient(timeout=30.0)
+        # HTTP/2 keep-alive pool to USGS with a short connect timeout
+        self.client = httpx.AsyncClient(
+            timeout=httpx.Timeout(10.0, connect=3.0),
+            http2=True,
+            limits=httpx.Limits(
+                max_keepalive_connections=20,
+                max_connections=50,
+                keepalive_expiry=60.0,
+            ),
+            headers={
+                "User-Agent": "telex-eq-agent/1.0",
+                "Accept-Encoding": "gzip",
+            },
+        )
+        self._cache: Dict[tuple, Tuple[float, List[EarthquakeEvent]]] = {}
+        self._inflight: Dict[tuple, asyncio.Task] = {}
 
     async def get_earthquakes(self, filters: EarthquakeFilter) -> List[EarthquakeEvent]:
+        hours_back = int(filters.hours_back or 24)
+        min_magnitude = filters.min_magnitude or 0
+        limit = min(max(filters.limit or 10, 1), 200)
+
+        # Location is filtered locally, so it is not part of the key
+        key = (hours_back, min_magnitude, filters.max_magnitude, limit)
+        now = time.monotonic()
+        cached = self._cache.get(key)
+        if cached and now - cached[0] < self.CACHE_TTL:
+            events = cached[1]
+        else:
+            events = await self._fetch_once(key, hours_back, min_magnitude, filters.max_magnitude, limit)
+            if events is None:
+                return []
+            self._cache = {k: v for k, v in self._cache.items() if now - v[0] < self.CACHE_TTL}
+            self._cache[key] = (time.monotonic(), events)
+
+        loc = (filters.location or "").strip()
+        if not loc:
+            return list(events)
+        # Case-insensitive search on the original text, no lowercased copy per event
+        loc_re = re.compile(re.escape(loc), re.IGNORECASE)
+        return [ev for ev in events if loc_re.search(ev.place)]
+
+    async def _fetch_once(self, key: tuple, *args) -> Optional[List[EarthquakeEvent]]:
+        """Share one USGS request between concurrent callers with the same key"""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch(*args))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shield so one cancelled caller does not cancel the request for the others
+        return await asyncio.shield(task)
+
+    async def _fetch(
+        self,
+        hours_back: int,
+        min_magnitude: float,
+        max_magnitude: Optional[float],
+        limit: int,
+    ) -> Optional[List[EarthquakeEvent]]:
         now = datetime.now(timezone.utc)
-        start = now - timedelta(hours=int(filters.hours_back or 24))
+        start = now - timedelta(hours=hours_back)
 
         params: Dict[str, str] = {
             "format": "geojson",
             "starttime": start.strftime("%Y-%m-%dT%H:%M:%SZ"),
             "endtime": now.strftime("%Y-%m-%dT%H:%M:%SZ"),
-            "minmagnitude": f"{filters.min_magnitude or 0}",
+            "minmagnitude": f"{min_magnitude}",
             "orderby": "time",
-            "limit": f"{min(max(filters.limit or 10, 1), 200)}",
+            "limit": f"{limit}",
         }
-        if filters.max_magnitude is not None:
-            params["maxmagnitude"] = f"{filters.max_magnitude}"
+        if max_magnitude is not None:
+            params["maxmagnitude"] = f"{max_magnitude}"
 
-        print("[USGS] Query params =>", params, flush=True)
+        logger.debug("[USGS] Query params => %s", params)
+
+        # Parse features as bytes arrive instead of buffering the whole body
+        events: List[EarthquakeEvent] = []
+        features = ijson.sendable_list()
+        parser = ijson.items_coro(features, "features.item", use_float=True)
 
         try:
-            resp = await self.client.get(self.BASE_URL, params=params)
-            resp.raise_for_status()
-            data = resp.json()
+            async with self.client.stream("GET", self.BASE_URL, params=params) as resp:
+                resp.raise_for_status()
+                async for chunk in resp.aiter_bytes():
+                    parser.send(chunk)
+                    events.extend(_to_events(features))
+                    del features[:]
+                    if len(events) >= limit:
+                        break
+                else:
+                    parser.close()
+                    events.extend(_to_events(features))
         except httpx.HTTPError as e:
-            print(f"[USGS] HTTP error: {e}", flush=True)
-            return []
+            logger.warning("[USGS] HTTP error: %s", e)
+            return None
+        except ijson.JSONError as e:
+            logger.warning("[USGS] Invalid JSON: %s", e)
+            return None
 
-        events: List[EarthquakeEvent] = []
-        loc = (filters.location or "").lower().strip() or None
-
-        for feat in data.get("features", []):
-            props = feat.get("properties") or {}
-            geom = feat.get("geometry") or {}
-            coords = (geom.get("coordinates") or [None, None, None])
-
-            if loc:
-                place_text = (props.get("place") or "").lower()
-                if loc not in place_text:
-                    continue
-
-            try:
-                events.append(
-                    EarthquakeEvent(
-                        id=feat.get("id", ""),
-                        magnitude=props.get("mag") or 0.0,
-                        place=props.get("place") or "Unknown location",
-                        time=datetime.fromtimestamp((props.get("time") or 0)/1000, tz=timezone.utc),
-                        latitude=float(coords[1]),
-                        longitude=float(coords[0]),
-                        depth=float(coords[2]),
-                        url=props.get("url") or "",
-                        alert_level=props.get("alert"),
-                        tsunami=(props.get("tsunami") == 1),
-                    )
-                )
-            except Exception as e:
-                print(f"[USGS] Skip malformed feature: {e}", flush=True)
-                continue
-
-        return events
+        return events[:limit]
 
     async def close(self):
-        await self.client.aclose()
\ No newline at end of file
+        await self.client.aclose()
@@ -1,14 +1,94 @@
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from datetime import datetime
-from typing import Any, Dict, Optional
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response
+import orjson
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+import logging
+import logging.handlers
+import os
+import queue
+import time
 
 from .agent import EarthquakeAgent
 
+# INFO by default, so per-request debug logging is skipped cheaply
+logging.basicConfig(level=logging.INFO)
+# httpx logs every USGS request at INFO
+logging.getLogger("httpx").setLevel(logging.WARNING)
+logger = logging.getLogger(__name__)
+
+# Loggers whose handlers write through the queue while the app runs: the root
+# logger (this app), uvicorn (and uvicorn.error under it) and uvicorn.access
+_QUEUED_LOGGERS = ("", "uvicorn", "uvicorn.access")
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Queue records unformatted, together with the handlers they are meant for"""
+
+    def __init__(self, log_queue: queue.SimpleQueue, targets: Tuple[logging.Handler, ...]):
+        super().__init__(log_queue)
+        self.targets = targets
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Records stay in process, so formatting is left to the listener
+        # thread; uvicorn's access formatter also needs record.args intact
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        self.queue.put_nowait((self.targets, record))
+
+
+class _QueueListener(logging.handlers.QueueListener):
+    """Hand each queued record to the handlers it was queued for"""
+
+    def handle(self, item):
+        targets, record = item
+        for handler in targets:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+
+@contextmanager
+def _queued_logging() -> Iterator[None]:
+    """Write log records from a listener thread instead of the event loop"""
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    original_handlers = {}
+    for name in _QUEUED_LOGGERS:
+        queued_logger = logging.getLogger(name)
+        if queued_logger.handlers:
+            original_handlers[queued_logger] = queued_logger.handlers
+            queued_logger.handlers = [_QueueHandler(log_queue, tuple(queued_logger.handlers))]
+
+    listener = _QueueListener(log_queue)
+    listener.start()
+    try:
+        yield
+    finally:
+        # Flush what is queued, then write directly again for the rest of shutdown
+        listener.stop()
+        for queued_logger, handlers in original_handlers.items():
+            queued_logger.handlers = handlers
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    with _queued_logging():
+        # Created inside the running loop so the USGS client's pool is bound to it
+        app.state.agent = EarthquakeAgent()
+
+        yield
+
+        await app.state.agent.close()
+
+
 app = FastAPI(
     title="Earthquake Monitoring Agent",
     description="Real-time global earthquake monitoring agent for Telex.im",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -19,76 +99,110 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-agent = EarthquakeAgent()
+# Multi-event replies are several KB of text; short ones are sent as-is
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+
+_SIMPLE_KEYS = ("text", "message", "prompt", "input", "query")
+
+# Bodies of the probe endpoints, encoded once instead of per request
+_ROOT_BODY = orjson.dumps({
+    "name": "Earthquake Monitoring Agent",
+    "version": "1.0.0",
+    "status": "active"
+})
+# (epoch second, encoded body) of the last /health response
+_health_cache = [0, b""]
+
+
+def _health_body() -> bytes:
+    """/health body with the current UTC time, encoded at most once per second"""
+    now = int(time.time())
+    if now != _health_cache[0]:
+        timestamp = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(now))
+        _health_cache[:] = [now, orjson.dumps({"status": "ok", "timestamp": timestamp})]
+    return _health_cache[1]
 
 
 def extract_text_from_request(data: Dict[str, Any]) -> Optional[str]:
     """Extract text from A2A payload"""
     # Simple keys
-    for key in ("text", "message", "prompt", "input", "query"):
-        val = data.get(key)
-        if isinstance(val, str) and val.strip():
-            return val.strip()
-
-    # JSON-RPC format (Telex)
-    params = data.get("params")
-    if isinstance(params, dict):
-        msg = params.get("message")
-        if isinstance(msg, dict):
-            parts = msg.get("parts")
-            if isinstance(parts, list):
-                for part in parts:
-                    if isinstance(part, dict) and part.get("kind") == "text":
-                        t = (part.get("text") or "").strip()
-                        if t:
-                            return t
+    get = data.get
+    for key in _SIMPLE_KEYS:
+        val = get(key)
+        if isinstance(val, str):
+            val = val.strip()
+            if val:
+                return val
+
+    # JSON-RPC format (Telex); a missing or non-dict level ends the lookup
+    try:
+        parts = data["params"]["message"]["parts"]
+    except (KeyError, TypeError):
+        return None
+    if not isinstance(parts, list):
+        return None
+    for part in parts:
+        try:
+            if part.get("kind") == "text":
+                t = (part.get("text") or "").strip()
+                if t:
+                    return t
+        except AttributeError:
+            continue
     return None
 
 
 @app.get("/")
 async def root():
-    return {
-        "name": "Earthquake Monitoring Agent",
-        "version": "1.0.0",
-        "status": "active"
-    }
+    return Response(_ROOT_BODY, media_type="application/json")
 
 
 @app.get("/health")
 async def health():
-    return {"status": "ok", "timestamp": datetime.utcnow().isoformat()}
+    return Response(_health_body(), media_type="application/json")
 
 
 @app.post("/a2a/agent/earthquake")
 async def telex_handler(request: Request):
     try:
-        body = await request.json()
+        body = orjson.loads(await request.body())
     except Exception:
         raise HTTPException(status_code=400, detail="Invalid JSON")
 
-    print(f"[A2A] Received body: {body}", flush=True)
+    logger.debug("[A2A] Received body: %s", body)
     
     text = extract_text_from_request(body)
     if not text:
         text = "recent"
     
-    print(f"[A2A] Extracted text: {text}", flush=True)
+    logger.debug("[A2A] Extracted text: %s", text)
 
-    result = await agent.process_message(text)
+    result = await request.app.state.agent.process_message(text)
 
     response = {
         "response": result.response,
         "conversationId": body.get("conversationId"),
         "metadata": {
-            "count": len(result.events or []),
+            "count": len(result.events) if result.events else 0,
             "agent_type": "earthquake_monitor"
         }
     }
     
-    print(f"[A2A] Sending response: {response['response'][:100]}...", flush=True)
-    return response
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    await agent.close()
\ No newline at end of file
+    logger.debug("[A2A] Sending response: %.100s...", response["response"])
+    # Returned as a Response so FastAPI skips jsonable_encoder on trusted data
+    return ORJSONResponse(response)
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    # Same server settings as the Procfile: no reload and httptools; "auto"
+    # picks uvloop when installed, as on Heroku, and asyncio elsewhere
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=int(os.getenv("PORT", "8000")),
+        loop="auto",
+        http="httptools",
+    )
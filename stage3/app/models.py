@@ -1,9 +1,12 @@
-from pydantic import BaseModel, Field
+from dataclasses import dataclass
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, List
-from datetime import datetime
 
 
 class EarthquakeFilter(BaseModel):
+    # Immutable and hashable so parsed filters can be cached and shared
+    model_config = ConfigDict(frozen=True)
+
     min_magnitude: Optional[float] = Field(default=4.5, description="Minimum magnitude")
     max_magnitude: Optional[float] = Field(default=None, description="Maximum magnitude")
     hours_back: Optional[int] = Field(default=24, description="Hours to look back")
@@ -11,11 +14,15 @@ class EarthquakeFilter(BaseModel):
     limit: Optional[int] = Field(default=10, description="Max results (1–200)")
 
 
-class EarthquakeEvent(BaseModel):
+# Built for every USGS feature from trusted data, so a slotted dataclass
+# instead of a validated model
+@dataclass(slots=True, frozen=True)
+class EarthquakeEvent:
     id: str
     magnitude: float
     place: str
-    time: datetime
+    # Epoch milliseconds as sent by USGS; converted only when formatted
+    time_ms: int
     latitude: float
     longitude: float
     depth: float